@@ -10,7 +10,8 @@ if getattr(sys, 'frozen', False):
 else:
     base_dir = Path(__file__).resolve().parent.parent
 
-sys.path.insert(0, str(base_dir))
+if str(base_dir) not in sys.path:
+    sys.path.insert(0, str(base_dir))
 
 from fpat.firewall_module import FirewallCollectorFactory
 from .parser import (
@@ -20,10 +21,7 @@ from .parser import (
     get_cli_commands_from_config,
     get_parameter_details,
     list_all_parameters,
-    get_prefix_map,
-    get_expected_values,
-    get_command_map,
-    get_command_prefix_map,
+    build_maps,
     validate_duplicate_commands
 )
 from .reporter import save_report_to_excel, save_text_summary
@@ -117,10 +115,7 @@ async def check_parameters(credentials: FirewallCredentials):
         config = load_expected_config(yaml_path)
         
         # 새로운 구조에서 필요한 정보 추출
-        prefix_map = get_prefix_map(config)
-        expected_values = get_expected_values(config)
-        command_prefix_map = get_command_prefix_map(config)
-        command_map = get_command_map(config)
+        prefix_map, expected_values, command_map, command_prefix_map, prefix_index = build_maps(config)
         
         # 방화벽 연결
         collector = create_firewall_collector(
@@ -140,7 +135,7 @@ async def check_parameters(credentials: FirewallCredentials):
             if cmd_name == 'show system setting ctd mode' and not ':' in output[0]:
                 output = [f'CTD mode is: {output[0]}']
             if success:
-                partial = parse_command_output(output, prefix_map)
+                partial = parse_command_output(output, prefix_map, prefix_index)
                 for k, v in partial.items():
                     parsed.setdefault(k, []).extend(v)
             else:
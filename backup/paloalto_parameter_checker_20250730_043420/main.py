@@ -9,7 +9,8 @@ if getattr(sys, 'frozen', False):
 else:
     base_dir = Path(__file__).resolve().parent.parent
 
-sys.path.insert(0, str(base_dir))
+if str(base_dir) not in sys.path:
+    sys.path.insert(0, str(base_dir))
 
 # 개선: 팩토리 패턴 사용으로 결합도 감소
 from fpat.firewall_module import FirewallCollectorFactory
@@ -20,10 +21,7 @@ from paloalto_parameter_checker.parser import (
     get_cli_commands_from_config,
     get_parameter_details,
     list_all_parameters,
-    get_prefix_map,
-    get_expected_values,
-    get_command_map,
-    get_command_prefix_map,
+    build_maps,
     validate_duplicate_commands
 )
 from paloalto_parameter_checker.reporter import save_report_to_excel, save_text_summary
@@ -188,10 +186,7 @@ def main():
         config = load_expected_config(yaml_path)
         
         # 새로운 구조에서 필요한 정보 추출
-        prefix_map = get_prefix_map(config)
-        expected_values = get_expected_values(config)
-        command_prefix_map = get_command_prefix_map(config)
-        command_map = get_command_map(config)
+        prefix_map, expected_values, command_map, command_prefix_map, prefix_index = build_maps(config)
         
         logger.info(f"설정 로드 완료: {len(expected_values)}개 파라미터")
 
@@ -212,7 +207,7 @@ def main():
             if cmd_name == 'show system setting ctd mode' and not ':' in output[0]:
                 output = [f'CTD mode is: {output[0]}']
             if success:
-                partial = parse_command_output(output, prefix_map)
+                partial = parse_command_output(output, prefix_map, prefix_index)
                 for k, v in partial.items():
                     parsed.setdefault(k, []).extend(v)
             else:
@@ -245,7 +240,8 @@ def main():
         # 콘솔 요약 출력 (상태 컬럼이 4번째로 변경됨)
         total = len(report)
         matched = sum(1 for item in report if item[3] == "일치")
-        print(f"\n점검 요약: 총 {total}개 중 {matched}개 정상 ({matched/total*100:.1f}%)")
+        rate = (matched / total * 100) if total else 0.0
+        print(f"\n점검 요약: 총 {total}개 중 {matched}개 정상 ({rate:.1f}%)")
         
     except Exception as e:
         logger.error(f"점검 중 오류 발생: {e}")
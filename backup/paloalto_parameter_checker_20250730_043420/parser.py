@@ -1,10 +1,43 @@
+import os
+import sys
+import mmap
 import yaml
 import logging
+import functools
 from pathlib import Path
+from typing import Iterable, NamedTuple
+
+# LibYAML이 설치되어 있으면 C 구현 로더 사용 (이 스키마는 문자열/리스트만 사용하므로
+# 타임스탬프/inf 처리 등 순수 Python 로더와의 미세한 차이는 영향 없음)
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=32)
+def _load_cached(path: str, mtime_ns: int, size: int):
+    """YAML 파일을 한 번만 파싱하여 캐시 (mtime/size가 바뀌면 자동 무효화)"""
+    if size == 0:
+        return None  # 빈 파일은 mmap할 수 없음 (yaml.load 결과와 동일하게 None)
+    
+    # 파일을 mmap으로 열어 파서가 페이지 캐시를 직접 읽도록 함 (UTF-8은 로더가 감지)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return yaml.load(mm, Loader=_Loader)
+
+def _get_config(yaml_path) -> dict:
+    """
+    캐시된 YAML 설정 반환
+
+    같은 파일을 여러 함수에서 반복해서 읽지 않도록 (경로, mtime, 크기)를 키로
+    파싱 결과를 공유합니다. 반환값은 캐시와 공유되므로 수정하지 않아야 합니다.
+    """
+    path = str(yaml_path)
+    st = os.stat(path)
+    return _load_cached(path, st.st_mtime_ns, st.st_size)
+
 def validate_yaml_structure(config: dict, yaml_path: str) -> bool:
     """
     새로운 YAML 구조의 유효성을 검증하는 함수
@@ -28,12 +61,12 @@ def validate_yaml_structure(config: dict, yaml_path: str) -> bool:
             if field not in param:
                 logger.error(f"{yaml_path}: parameters[{i}]에 필수 필드 '{field}'가 없습니다.")
                 return False
-        
-        # 파라미터 이름 중복 검사
-        param_names = [p['name'] for p in config['parameters']]
-        if len(param_names) != len(set(param_names)):
-            logger.error(f"{yaml_path}: 중복된 파라미터 이름이 있습니다.")
-            return False
+    
+    # 파라미터 이름 중복 검사 (필드 검증 후 한 번만 수행)
+    param_names = [p['name'] for p in config['parameters']]
+    if len(param_names) != len(set(param_names)):
+        logger.error(f"{yaml_path}: 중복된 파라미터 이름이 있습니다.")
+        return False
     
     logger.info(f"{yaml_path}: 새로운 구조 검증 성공 ({len(config['parameters'])}개 파라미터)")
     return True
@@ -48,12 +81,12 @@ def load_expected_config(yaml_path: str) -> dict:
         raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {yaml_path}")
     
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = _get_config(yaml_path)
     except yaml.YAMLError as e:
-        raise ValueError(f"YAML 파싱 오류: {e}")
+        # mmap 입력에는 스트림 이름이 없어 오류 위치가 "<file>"로 표시되므로 경로를 함께 표시
+        raise ValueError(f"YAML 파싱 오류 ({yaml_path}): {e}")
     except Exception as e:
-        raise ValueError(f"파일 읽기 오류: {e}")
+        raise ValueError(f"파일 읽기 오류 ({yaml_path}): {e}")
     
     if not config:
         raise ValueError(f"빈 설정 파일입니다: {yaml_path}")
@@ -66,97 +99,139 @@ def load_expected_config(yaml_path: str) -> dict:
     return config
 
 def get_prefix_map(config: dict) -> dict:
-    """새로운 구조에서 prefix_map 생성"""
-    prefix_map = {}
-    for param in config['parameters']:
-        if 'output_prefix' in param:
-            prefix_map[param['output_prefix']] = param['name']
-    return prefix_map
+    """새로운 구조에서 prefix_map 생성 (build_maps 결과와 공유하므로 수정 금지)"""
+    return build_maps(config).prefix_map
 
 def get_expected_values(config: dict) -> dict:
-    """새로운 구조에서 expected_values 추출"""
-    expected_values = {}
-    for param in config['parameters']:
-        expected_values[param['name']] = param['expected_value']
-    return expected_values
+    """새로운 구조에서 expected_values 추출 (build_maps 결과와 공유하므로 수정 금지)"""
+    return build_maps(config).expected_values
 
 def get_command_map(config: dict) -> dict:
-    """새로운 구조에서 command_map 생성 - 중복 api_command 처리 개선"""
+    """새로운 구조에서 command_map 생성 - 중복 api_command는 한 번만 등록 (build_maps 결과와 공유)"""
+    return build_maps(config).command_map
+
+def get_command_prefix_map(config: dict) -> dict:
+    """새로운 구조에서 command_prefix_map 생성 - 중복 prefix는 한 번만 등록 (build_maps 결과와 공유)"""
+    command_prefix_map = build_maps(config).command_prefix_map
+    
+    # 통계 로깅
+    total_prefixes = sum(len(prefixes) for prefixes in command_prefix_map.values())
+    logger.info(f"명령어-prefix 매핑 완료: {len(command_prefix_map)}개 명령어, {total_prefixes}개 prefix")
+    
+    return command_prefix_map
+
+class ConfigView(NamedTuple):
+    """설정에서 파생된 점검용 매핑 묶음 (튜플처럼 언패킹 가능)"""
+    prefix_map: dict
+    expected_values: dict
+    command_map: dict
+    command_prefix_map: dict
+    prefix_index: dict  # parse_command_output용 첫 글자 인덱스
+
+# id(config) -> (config, ConfigView); config를 함께 보관하므로 id가 재사용되지 않음
+_MAPS_CACHE = {}
+_MAPS_CACHE_SIZE = 32
+
+def _intern(value):
+    """문자열만 intern (YAML에서 숫자 등으로 읽힌 값은 그대로 반환)"""
+    return sys.intern(value) if type(value) is str else value
+
+def build_maps(config: dict) -> ConfigView:
+    """
+    파라미터를 한 번만 순회하여 점검에 필요한 매핑을 모두 생성
+
+    get_prefix_map / get_expected_values / get_command_map / get_command_prefix_map은
+    이 결과의 각 필드를 반환하며, api_command 분리는 파라미터당 한 번만 수행합니다.
+    같은 config 객체에 대해서는 이전 결과를 재사용하므로 반환된 매핑은 수정하지 않아야 합니다.
+
+    Returns:
+        ConfigView: (prefix_map, expected_values, command_map, command_prefix_map, prefix_index)
+    """
+    cached = _MAPS_CACHE.get(id(config))
+    if cached is not None and cached[0] is config:
+        return cached[1]
+    
+    prefix_map = {}
+    expected_values = {}
     command_map = {}
+    command_prefix_map = {}
     commands_seen = set()
-    duplicate_commands = []
+    duplicate_count = 0
     
     for param in config['parameters']:
+        name = _intern(param['name'])
         api_cmd = param['api_command']
+        output_prefix = param.get('output_prefix')
         
-        # 중복 명령어 감지 및 로깅
-        if api_cmd in commands_seen:
-            duplicate_commands.append({
-                'command': api_cmd,
-                'parameter': param['name']
-            })
-            logger.info(f"중복 API 명령어 감지 - 재사용: {api_cmd} (파라미터: {param['name']})")
-            continue
+        if output_prefix is not None:
+            output_prefix = _intern(output_prefix)
+            prefix_map[output_prefix] = name
+        expected_values[name] = param['expected_value']
         
-        # API 명령어에서 실제 설명 부분 추출
+        # API 명령어에서 설명/실제 명령어 분리 (한 번만)
         if ' - ' in api_cmd:
             description, actual_cmd = api_cmd.split(' - ', 1)
-            command_map[description.strip()] = actual_cmd.strip()
-            logger.debug(f"명령어 등록: {description.strip()} -> {actual_cmd.strip()}")
+            command_key = sys.intern(description.strip())
+            actual_cmd = sys.intern(actual_cmd.strip())
+            group_key = command_key
         else:
-            command_map[api_cmd] = api_cmd
-            logger.debug(f"명령어 등록: {api_cmd}")
-        
-        commands_seen.add(api_cmd)
-    
-    # 중복 명령어 통계 로깅
-    if duplicate_commands:
-        logger.info(f"중복 제거 완료: {len(duplicate_commands)}개 중복 명령어 발견")
-        for dup in duplicate_commands:
-            logger.debug(f"  - {dup['command']} (파라미터: {dup['parameter']})")
-    else:
-        logger.debug("중복된 API 명령어 없음")
-    
-    logger.info(f"총 {len(command_map)}개의 고유 명령어 등록 완료")
-    return command_map
-
-def get_command_prefix_map(config: dict) -> dict:
-    """새로운 구조에서 command_prefix_map 생성 - 중복 처리 개선"""
-    command_prefix_map = {}
-    
-    for param in config['parameters']:
-        api_cmd = param['api_command']
+            command_key = actual_cmd = group_key = sys.intern(api_cmd)
         
-        # API 명령어에서 설명 부분만 추출
-        if ' - ' in api_cmd:
-            description = api_cmd.split(' - ', 1)[0].strip()
+        # 중복 명령어는 한 번만 등록
+        if api_cmd in commands_seen:
+            duplicate_count += 1
+            logger.info(f"중복 API 명령어 감지 - 재사용: {api_cmd} (파라미터: {name})")
         else:
-            description = api_cmd
-            
-        # 명령어별 prefix 리스트 관리
-        if description not in command_prefix_map:
-            command_prefix_map[description] = []
-            logger.debug(f"새 명령어 그룹 생성: {description}")
+            command_map[command_key] = actual_cmd
+            commands_seen.add(api_cmd)
         
-        # prefix 중복 체크
-        output_prefix = param['output_prefix']
-        if output_prefix not in command_prefix_map[description]:
-            command_prefix_map[description].append(output_prefix)
-            logger.debug(f"prefix 등록: {description} -> {output_prefix}")
+        # 명령어별 prefix 리스트 관리
+        prefixes = command_prefix_map.setdefault(group_key, [])
+        if output_prefix not in prefixes:
+            prefixes.append(output_prefix)
         else:
-            logger.warning(f"중복 prefix 발견: {description} -> {output_prefix}")
+            logger.warning(f"중복 prefix 발견: {group_key} -> {output_prefix}")
     
-    # 통계 로깅
-    total_prefixes = sum(len(prefixes) for prefixes in command_prefix_map.values())
-    logger.info(f"명령어-prefix 매핑 완료: {len(command_prefix_map)}개 명령어, {total_prefixes}개 prefix")
+    if duplicate_count:
+        logger.info(f"중복 제거 완료: {duplicate_count}개 중복 명령어 발견")
+    logger.info(f"총 {len(command_map)}개의 고유 명령어 등록 완료")
     
-    return command_prefix_map
+    view = ConfigView(prefix_map, expected_values, command_map, command_prefix_map,
+                      _build_prefix_index(prefix_map))
+    if len(_MAPS_CACHE) >= _MAPS_CACHE_SIZE:
+        _MAPS_CACHE.clear()
+    _MAPS_CACHE[id(config)] = (config, view)
+    return view
+
+def _build_prefix_index(prefix_map: dict) -> dict:
+    """
+    prefix를 첫 글자 기준으로 묶은 인덱스 생성
+
+    각 라인마다 모든 prefix에 startswith를 호출하는 대신 첫 글자가 같은
+    후보만 검사하기 위해 사용합니다. 버킷 안의 순서는 prefix_map 순서를 유지합니다.
+    빈 prefix("")는 모든 라인과 일치하므로 모든 버킷에 포함되며, '' 버킷은
+    어느 첫 글자 버킷에도 해당하지 않는 라인에 사용됩니다.
+    """
+    index = {'': []}
+    for prefix, key in prefix_map.items():
+        if prefix:
+            # 새 버킷은 앞서 등록된 빈 prefix를 먼저 포함 (prefix_map 순서 유지)
+            index.setdefault(prefix[0], list(index[''])).append((prefix, key))
+        else:
+            for bucket in index.values():
+                bucket.append((prefix, key))
+    return index
 
-def parse_command_output(output: str, prefix_map: dict) -> dict:
+def parse_command_output(lines: Iterable[str], prefix_map: dict, prefix_index: dict = None) -> dict:
     """
     개선된 명령어 출력 파싱 함수 - 에러 처리 강화
+
+    lines는 이미 줄 단위로 나뉜 시퀀스나 이터레이터(파일 객체, 제너레이터 등)를
+    받으므로 전체 출력을 메모리에 올리지 않고 한 줄씩 처리할 수 있습니다.
+    문자열이 전달되면 줄 단위로 나누어 처리합니다.
+    명령어마다 호출할 때는 build_maps가 만든 prefix_index를 넘겨 인덱스 재생성을 피합니다.
     """
-    if not output:
+    if not lines:
         logger.warning("빈 출력 데이터")
         return {}
     
@@ -164,23 +239,34 @@ def parse_command_output(output: str, prefix_map: dict) -> dict:
         logger.warning("빈 prefix_map")
         return {}
     
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    
     result = {}
-    lines = output
+    # 루프 안의 속성 조회를 줄이기 위해 메서드를 지역 변수로 바인딩
+    if prefix_index is None:
+        prefix_index = _build_prefix_index(prefix_map)
+    candidates_for = prefix_index.get
+    no_match = prefix_index.get('', ())
 
     for line in lines:
-        line = line.strip().rstrip(',')
+        line = line.strip()
         if not line:  # 빈 라인 스킵
             continue
+        if line.endswith(','):
+            line = line.rstrip(',')
+            if not line:
+                continue
             
-        for prefix, key in prefix_map.items():
+        for prefix, key in candidates_for(line[0], no_match):
             if line.startswith(prefix):
-                parts = line.split(": ", 1)
-                if len(parts) == 2:
-                    value = parts[1].strip()
+                _, sep, value = line.partition(": ")
+                if sep:
+                    value = value.strip()
                     result.setdefault(key, []).append(value)
-                    logger.debug(f"파싱 성공: {key} = {value}")
+                    logger.debug("파싱 성공: %s = %s", key, value)
                 else:
-                    logger.warning(f"파싱 실패 - 잘못된 형식: {line}")
+                    logger.warning("파싱 실패 - 잘못된 형식: %s", line)
     
     return result
 
@@ -190,12 +276,17 @@ def compare_with_expected(parsed: dict, expected: dict, failed_keys: set, yaml_p
     컬럼: 항목, 현재값, 기대값, 상태, 확인 방법, 변경 방법
     """
     report = []
+    matched = 0
     
-    # CLI 명령어 정보 가져오기
-    cli_commands = {}
+    # CLI 명령어 정보 가져오기 - (조회, 변경) 튜플로 미리 변환하여 루프에서는 한 번만 조회
+    cli_lookup = {}
     if yaml_path:
         try:
             cli_commands = get_cli_commands_from_config(yaml_path)
+            cli_lookup = {
+                name: (info.get('query_command', ''), info.get('modify_command', ''))
+                for name, info in cli_commands.items()
+            }
         except Exception as e:
             logger.warning(f"CLI 명령어 정보 로드 실패: {e}")
     
@@ -203,44 +294,46 @@ def compare_with_expected(parsed: dict, expected: dict, failed_keys: set, yaml_p
         exp_value = str(exp_value)
         actual_values = parsed.get(key)
         
-        # CLI 명령어 정보 가져오기
-        cli_info = cli_commands.get(key, {})
-        query_cmd = cli_info.get('query_command', '')
-        modify_cmd = cli_info.get('modify_command', '')
+        query_cmd, modify_cmd = cli_lookup.get(key, ('', ''))
 
         # 1. 명령어 자체 실패
         if key in failed_keys:
             report.append((key, "없음", exp_value, "명령어 실패", query_cmd, modify_cmd))
-            logger.warning(f"명령어 실패: {key}")
+            logger.warning("명령어 실패: %s", key)
             continue
         
         # 2. 응답에서 값을 찾을 수 없음
         if actual_values is None:
             report.append((key, "없음", exp_value, "값 없음", query_cmd, modify_cmd))
-            logger.warning(f"값 없음: {key}")
+            logger.warning("값 없음: %s", key)
             continue
         
         # 3. 값 비교
         if isinstance(actual_values, list):
             current_value = ", ".join(actual_values)
-            if all(v == exp_value for v in actual_values):
+            # 부분집합 비교는 C 레벨에서 수행됨 (all(v == exp_value ...)과 동일한 의미)
+            if set(actual_values) <= {exp_value}:
                 report.append((key, current_value, exp_value, "일치", query_cmd, modify_cmd))
-                logger.info(f"일치: {key} = {exp_value}")
+                matched += 1
+                logger.info("일치: %s = %s", key, exp_value)
             else:
                 report.append((key, current_value, exp_value, "불일치", query_cmd, modify_cmd))
-                logger.warning(f"불일치: {key} - 현재: {actual_values}, 기대: {exp_value}")
+                logger.warning("불일치: %s - 현재: %s, 기대: %s", key, actual_values, exp_value)
         else:
             actual_values = str(actual_values)
             if actual_values == exp_value:
                 report.append((key, actual_values, exp_value, "일치", query_cmd, modify_cmd))
-                logger.info(f"일치: {key} = {exp_value}")
+                matched += 1
+                logger.info("일치: %s = %s", key, exp_value)
             else:
                 report.append((key, actual_values, exp_value, "불일치", query_cmd, modify_cmd))
-                logger.warning(f"불일치: {key} - 현재: {actual_values}, 기대: {exp_value}")
+                logger.warning("불일치: %s - 현재: %s, 기대: %s", key, actual_values, exp_value)
     
-    # 요약 통계 (상태는 4번째 컬럼)
+    # 요약 통계 (일치 건수는 비교 루프에서 집계)
     total = len(report)
-    matched = sum(1 for item in report if item[3] == "일치")
+    if not total:
+        logger.info("비교 대상 없음")
+        return report
     logger.info(f"비교 완료: 총 {total}개 중 {matched}개 일치 ({matched/total*100:.1f}%)")
     
     return report
@@ -250,8 +343,7 @@ def get_cli_commands_from_config(yaml_path: str) -> dict:
     새로운 구조에서 CLI 명령어들을 추출하는 함수
     """
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = _get_config(yaml_path)
     except Exception as e:
         logger.error(f"CLI 명령어 추출 실패: {e}")
         return {}
@@ -272,24 +364,37 @@ def get_cli_commands_from_config(yaml_path: str) -> dict:
     logger.debug(f"CLI 명령어 추출 완료: {len(cli_commands)}개")
     return cli_commands
 
+@functools.lru_cache(maxsize=8)
+def _load_parameter_index(path: str, mtime_ns: int, size: int):
+    """파라미터 이름 -> 상세 정보 dict 캐시 (같은 이름이 여러 번 나오면 첫 항목 사용)"""
+    config = _load_cached(path, mtime_ns, size)
+    if not config or 'parameters' not in config:
+        return None
+    
+    index = {}
+    for param in config['parameters']:
+        index.setdefault(param['name'], param)
+    return index
+
 def get_parameter_details(yaml_path: str, parameter_name: str) -> dict:
     """
     특정 파라미터의 모든 정보를 반환하는 함수
     """
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        path = str(yaml_path)
+        st = os.stat(path)
+        index = _load_parameter_index(path, st.st_mtime_ns, st.st_size)
     except Exception as e:
         logger.error(f"파라미터 상세 정보 추출 실패: {e}")
         return {}
     
-    if 'parameters' not in config:
+    if index is None:
         logger.warning("새로운 구조가 아니므로 상세 정보가 제한됩니다.")
         return {}
     
-    for param in config['parameters']:
-        if param['name'] == parameter_name:
-            return param
+    param = index.get(parameter_name)
+    if param is not None:
+        return param
     
     logger.warning(f"파라미터를 찾을 수 없습니다: {parameter_name}")
     return {}
@@ -299,8 +404,7 @@ def list_all_parameters(yaml_path: str) -> list:
     모든 파라미터 목록을 반환하는 함수
     """
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = _get_config(yaml_path)
     except Exception as e:
         logger.error(f"파라미터 목록 추출 실패: {e}")
         return []
@@ -327,8 +431,7 @@ def validate_duplicate_commands(yaml_path: str) -> dict:
         }
     """
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = _get_config(yaml_path)
     except Exception as e:
         logger.error(f"YAML 파일 읽기 실패: {e}")
         return {'error': str(e)}
@@ -339,10 +442,7 @@ def validate_duplicate_commands(yaml_path: str) -> dict:
     # api_command별 파라미터 그룹핑
     command_groups = {}
     for param in config['parameters']:
-        api_cmd = param['api_command']
-        if api_cmd not in command_groups:
-            command_groups[api_cmd] = []
-        command_groups[api_cmd].append({
+        command_groups.setdefault(param['api_command'], []).append({
             'name': param['name'],
             'description': param.get('description', ''),
             'output_prefix': param['output_prefix']
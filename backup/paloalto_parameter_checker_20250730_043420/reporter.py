@@ -1,153 +1,199 @@
-import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from collections import Counter
 from datetime import datetime
 import os
 import logging
 from pathlib import Path
 
+try:
+    import xlsxwriter  # 선택 의존성: 설치되어 있으면 임시 파일 없이 한 번에 기록
+except ImportError:
+    xlsxwriter = None
+
 logger = logging.getLogger(__name__)
 
+# 새로운 컬럼 구조: 항목, 현재값, 기대값, 상태, 확인 방법, 변경 방법
+REPORT_COLUMNS = ["항목", "현재값", "기대값", "상태", "확인 방법", "변경 방법"]
+LEFT_ALIGNED_COLUMNS = (0, 4, 5)  # 항목, 확인 방법, 변경 방법은 왼쪽 정렬
+STATUS_COLUMN = 3
+STATUS_COLOR_MAP = {
+    "일치": "C6EFCE",      # 연한 녹색
+    "불일치": "FFC7CE",    # 연한 빨간색  
+    "값 없음": "D9D9D9",   # 회색
+    "명령어 실패": "FFEB9C", # 연한 노란색
+}
+# 텍스트 요약의 상태 표시
+STATUS_PREFIX_MAP = {
+    "일치": "[정상]",
+    "불일치": "[불일치]", 
+    "값 없음": "[값없음]",
+    "명령어 실패": "[실패]"
+}
+# 각 컬럼별 적절한 기본(최소) 너비
+MIN_COLUMN_WIDTHS = [25, 20, 20, 12, 30, 30]
+
+# openpyxl 스타일 객체 (행마다 새로 만들지 않고 재사용)
+_BOLD = Font(bold=True)
+_CENTER = Alignment(horizontal="center", vertical="center")
+_LEFT = Alignment(horizontal="left", vertical="center")
+_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin")
+)
+_HEADER_FILL = PatternFill("solid", fgColor="DDDDDD")
+_STATUS_FILLS = {status: PatternFill("solid", fgColor=color) for status, color in STATUS_COLOR_MAP.items()}
+
 def save_report_to_excel(report: list, filename: str, hostname: str, yaml_path: str = None):
     """
     개선된 엑셀 리포트 저장 함수 - 새로운 컬럼 구조와 명령어 정보 통합
     """
-    # 새로운 컬럼 구조: 항목, 현재값, 기대값, 상태, 확인 방법, 변경 방법
-    df = pd.DataFrame(report, columns=["항목", "현재값", "기대값", "상태", "확인 방법", "변경 방법"])
+    if xlsxwriter is not None:
+        _save_report_with_xlsxwriter(report, filename, hostname)
+        logger.info(f"리포트 저장 완료: {filename}")
+        return
+    
+    # write-only 워크북에 스타일이 지정된 셀을 행 단위로 기록 (셀을 메모리에 유지하지 않음)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("점검결과")
 
-    tmp_filename = "_tmp_report.xlsx"
-    df.to_excel(tmp_filename, index=False, startrow=4, startcol=1)  # 상단 정보 공간
+    # 컬럼 폭 조정 (write-only 모드에서는 행을 쓰기 전에 지정해야 함)
+    ws.column_dimensions["A"].width = 3.0
+    _adjust_column_widths(ws, report)
 
-    wb = load_workbook(tmp_filename)
-    ws = wb.active
-    ws.title = "점검결과"
+    # 상단 요약 정보 (B1~B4)
+    for line in _header_lines(hostname, report):
+        ws.append([None, _styled_cell(ws, line, font=_BOLD)])
 
-    # 상단 요약 정보
-    _add_header_info(ws, hostname, report)
+    # 헤더 (5행)
+    ws.append([None] + [
+        _styled_cell(ws, header, font=_BOLD, fill=_HEADER_FILL, alignment=_CENTER, border=_BORDER)
+        for header in REPORT_COLUMNS
+    ])
 
-    # 컬럼 폭 조정
-    ws.column_dimensions["A"].width = 3.0
+    # 데이터 (6행부터) - 상태 컬럼에만 색상 적용
+    for item in report:
+        row = [None]
+        for i, value in enumerate(item):
+            row.append(_styled_cell(
+                ws, value,
+                fill=_STATUS_FILLS.get(value) if i == STATUS_COLUMN else None,
+                alignment=_LEFT if i in LEFT_ALIGNED_COLUMNS else _CENTER,
+                border=_BORDER
+            ))
+        ws.append(row)
 
-    # 헤더 스타일링
-    _style_headers(ws)
-    
-    # 데이터 스타일링
-    _style_data_rows(ws)
-    
-    # 컬럼 너비 자동 조정
-    _adjust_column_widths(ws)
-    
     wb.save(filename)
-    os.remove(tmp_filename)
     
     logger.info(f"리포트 저장 완료: {filename}")
 
-def _add_header_info(ws, hostname: str, report: list):
-    """상단 헤더 정보 추가 - 이모지와 성공률 제거"""
-    ws["B1"] = f"점검일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    ws["B2"] = f"대상장비: {hostname}"
-    
-    # 요약 통계 추가 (이모지 제거)
-    total = len(report)
-    matched = sum(1 for item in report if item[3] == "일치")  # 상태 컬럼이 4번째로 변경
-    failed = sum(1 for item in report if item[3] == "명령어 실패")
-    mismatched = sum(1 for item in report if item[3] == "불일치")
-    missing = sum(1 for item in report if item[3] == "값 없음")
+def _save_report_with_xlsxwriter(report: list, filename: str, hostname: str):
+    """xlsxwriter로 리포트를 한 번에 기록 (임시 파일/재로딩 없음)"""
+    wb = xlsxwriter.Workbook(filename, {'strings_to_formulas': False, 'strings_to_urls': False})
+    try:
+        ws = wb.add_worksheet("점검결과")
+        
+        # 서식은 한 번만 생성하여 재사용
+        bold_format = wb.add_format({'bold': True})
+        header_format = wb.add_format({
+            'bold': True, 'bg_color': '#DDDDDD', 'border': 1,
+            'align': 'center', 'valign': 'vcenter'
+        })
+        left_format = wb.add_format({'border': 1, 'align': 'left', 'valign': 'vcenter'})
+        center_format = wb.add_format({'border': 1, 'align': 'center', 'valign': 'vcenter'})
+        status_formats = {
+            status: wb.add_format({
+                'border': 1, 'align': 'center', 'valign': 'vcenter', 'bg_color': f'#{color}'
+            })
+            for status, color in STATUS_COLOR_MAP.items()
+        }
+        column_formats = [
+            left_format if i in LEFT_ALIGNED_COLUMNS else center_format
+            for i in range(len(REPORT_COLUMNS))
+        ]
+        
+        # 상단 요약 정보 (B1~B4)
+        for row, line in enumerate(_header_lines(hostname, report)):
+            ws.write_string(row, 1, line, bold_format)
+        
+        # 컬럼 폭 조정
+        ws.set_column(0, 0, 3.0)
+        for i, width in enumerate(_calculate_column_widths(report)):
+            ws.set_column(i + 1, i + 1, width)
+        
+        # 헤더 (5행) 및 데이터 (6행부터)
+        ws.write_row(4, 1, REPORT_COLUMNS, header_format)
+        for row, item in enumerate(report, 5):
+            for i, value in enumerate(item):
+                cell_format = column_formats[i]
+                if i == STATUS_COLUMN:
+                    cell_format = status_formats.get(value, cell_format)
+                ws.write(row, i + 1, value, cell_format)
+    finally:
+        wb.close()
+
+def _count_statuses(report: list) -> tuple:
+    """상태별 건수를 한 번의 순회로 집계: (전체, 일치, 불일치, 값 없음, 명령어 실패)"""
+    if not report:
+        return 0, 0, 0, 0, 0
     
-    ws["B3"] = f"점검 결과: 총 {total}개 항목"
-    ws["B4"] = f"정상: {matched}개 | 불일치: {mismatched}개 | 오류: {failed + missing}개"
+    counts = Counter(item[STATUS_COLUMN] for item in report)
+    return len(report), counts["일치"], counts["불일치"], counts["값 없음"], counts["명령어 실패"]
+
+def _header_lines(hostname: str, report: list) -> list:
+    """상단 요약 정보 텍스트 (B1~B4)"""
+    total, matched, mismatched, missing, failed = _count_statuses(report)
     
-    # 폰트 스타일 적용
-    for row in range(1, 5):
-        ws[f"B{row}"].font = Font(bold=True)
-
-def _style_headers(ws):
-    """헤더 스타일링 - 새로운 6개 컬럼에 맞게 조정"""
-    header_fill = PatternFill("solid", fgColor="DDDDDD")
-    header_font = Font(bold=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
-
-    for col_num in range(2, 8):  # B~G 컬럼 (6개 컬럼)
-        cell = ws.cell(row=5, column=col_num)  # 헤더 행 조정
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+    return [
+        f"점검일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"대상장비: {hostname}",
+        f"점검 결과: 총 {total}개 항목",
+        f"정상: {matched}개 | 불일치: {mismatched}개 | 오류: {failed + missing}개",
+    ]
+
+def _calculate_column_widths(report: list) -> list:
+    """헤더와 데이터 길이로 각 컬럼 너비 계산 (최소 너비 ~ 최대 50)"""
+    widths = []
+    for i, header in enumerate(REPORT_COLUMNS):
+        max_len = max([len(header)] + [len(str(item[i])) for item in report if item[i]])
+        widths.append(min(max(max_len + 2, MIN_COLUMN_WIDTHS[i]), 50))
+    return widths
+
+def _styled_cell(ws, value, font=None, fill=None, alignment=None, border=None) -> WriteOnlyCell:
+    """스타일이 지정된 write-only 셀 생성"""
+    cell = WriteOnlyCell(ws, value=value)
+    if font:
+        cell.font = font
+    if fill:
+        cell.fill = fill
+    if alignment:
+        cell.alignment = alignment
+    if border:
         cell.border = border
+    return cell
 
-def _style_data_rows(ws):
-    """데이터 행 스타일링 - 새로운 컬럼 구조에 맞게 조정"""
-    status_color_map = {
-        "일치": "C6EFCE",      # 연한 녹색
-        "불일치": "FFC7CE",    # 연한 빨간색  
-        "값 없음": "D9D9D9",   # 회색
-        "명령어 실패": "FFEB9C", # 연한 노란색
-    }
-    
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin")
-    )
-
-    for row in ws.iter_rows(min_row=6, max_row=ws.max_row, min_col=2, max_col=7):  # 6개 컬럼
-        for i, cell in enumerate(row):
-            if i == 0 or i == 4 or i == 5:  # 항목, 확인 방법, 변경 방법은 왼쪽 정렬
-                cell.alignment = Alignment(horizontal="left", vertical="center")
-            else:
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-        
-        # 상태 컬럼(4번째, 인덱스 3)에 색상 적용
-        if len(row) > 3:
-            status = row[3].value
-            fill_color = status_color_map.get(status)
-            if fill_color:
-                row[3].fill = PatternFill("solid", fgColor=fill_color)
-
-def _adjust_column_widths(ws):
-    """컬럼 너비 자동 조정 - 6개 컬럼에 맞게 조정"""
-    # 각 컬럼별 적절한 기본 너비 설정
-    column_widths = {
-        2: 25,  # 항목
-        3: 20,  # 현재값
-        4: 20,  # 기대값
-        5: 12,  # 상태
-        6: 30,  # 확인 방법
-        7: 30   # 변경 방법
-    }
-    
-    for col in range(2, 8):  # B~G 컬럼
-        max_len = 0
-        for row in range(5, ws.max_row + 1):
-            cell_value = ws.cell(row=row, column=col).value
-            if cell_value:
-                max_len = max(max_len, len(str(cell_value)))
-        
-        # 최소/최대 너비 제한
-        min_width = column_widths.get(col, 15)
-        width = min(max(max_len + 2, min_width), 50)
-        ws.column_dimensions[get_column_letter(col)].width = width
+def _adjust_column_widths(ws, report: list):
+    """컬럼 너비 자동 조정 - 셀을 다시 읽지 않고 report 데이터로 계산"""
+    for i, width in enumerate(_calculate_column_widths(report)):
+        ws.column_dimensions[get_column_letter(i + 2)].width = width  # B~G 컬럼
 
-def generate_summary_report(report: list, hostname: str) -> str:
+def generate_summary_report(report: list, hostname: str, now: datetime = None) -> str:
     """
     요약 리포트 텍스트 생성 - 이모지 제거
+
+    now를 전달하면 점검 시간으로 사용합니다 (파일명 날짜와 같은 시각을 쓰기 위함).
     """
-    total = len(report)
-    matched = sum(1 for item in report if item[3] == "일치")  # 상태 컬럼이 4번째로 변경
-    failed = sum(1 for item in report if item[3] == "명령어 실패")
-    mismatched = sum(1 for item in report if item[3] == "불일치")
-    missing = sum(1 for item in report if item[3] == "값 없음")
+    if now is None:
+        now = datetime.now()
+    total, matched, mismatched, missing, failed = _count_statuses(report)
     
-    summary = f"""
+    parts = [f"""
 === Palo Alto 파라미터 점검 요약 ===
-점검 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+점검 시간: {now.strftime('%Y-%m-%d %H:%M:%S')}
 대상 장비: {hostname}
 
 점검 결과:
@@ -158,27 +204,24 @@ def generate_summary_report(report: list, hostname: str) -> str:
 • 명령어 실패: {failed}개
 
 상세 결과:
-"""
+"""]
     
+    # 줄 단위로 모은 뒤 한 번에 합침 (반복적인 문자열 += 방지)
+    append = parts.append
     for item in report:
-        status_prefix = {
-            "일치": "[정상]",
-            "불일치": "[불일치]", 
-            "값 없음": "[값없음]",
-            "명령어 실패": "[실패]"
-        }.get(item[3], "[알수없음]")
-        
-        summary += f"{status_prefix} {item[0]}: {item[3]}\n"
+        status_prefix = STATUS_PREFIX_MAP.get(item[3], "[알수없음]")
+        append(f"{status_prefix} {item[0]}: {item[3]}\n")
     
-    return summary
+    return "".join(parts)
 
 def save_text_summary(report: list, hostname: str, output_dir: str = "."):
     """
     텍스트 요약 파일 저장
     """
-    summary = generate_summary_report(report, hostname)
+    now = datetime.now()
+    summary = generate_summary_report(report, hostname, now)
     
-    today = datetime.now().date()
+    today = now.date()
     filename = os.path.join(output_dir, f"{today}_parameter_check_summary_{hostname}.txt")
     
     try:
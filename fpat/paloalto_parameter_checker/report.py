@@ -8,110 +8,66 @@ import json
 from datetime import datetime
 from typing import List, Dict
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
 from openpyxl.utils import get_column_letter
 
+try:
+    import xlsxwriter  # 선택 의존성: 설치되어 있으면 constant_memory 모드로 더 빠르게 저장
+except ImportError:
+    xlsxwriter = None
+
+REPORT_TITLE = "Palo Alto Parameter Check Report"
+SHEET_TITLE = "Parameter Check Report"
+HEADERS = ['파라미터', '기대값', '현재값', '상태', '조회 방법', '변경 방법']
+FIELDS = ['parameter', 'expected', 'current', 'status', 'query_method', 'modify_method']
+HEADER_COLOR = "4472C4"
+STATUS_COLORS = {'PASS': "C6EFCE", 'FAIL': "FFC7CE", 'ERROR': "FFEB9C"}
+HEADER_ROW = 9  # 제목(1), 요약(3~7) 다음 행
+
 class ReportGenerator:
-    def __init__(self, reports_dir: str = "reports"):
+    def __init__(self, reports_dir: str = "reports", excel_engine: str = "auto"):
+        """
+        Args:
+            reports_dir: 리포트 저장 디렉토리
+            excel_engine: "auto"(xlsxwriter가 있으면 사용), "xlsxwriter", "openpyxl"
+        """
         self.reports_dir = reports_dir
+        self.excel_engine = excel_engine
         os.makedirs(reports_dir, exist_ok=True)
     
     def generate_excel_report(self, results: List[Dict], summary: Dict, 
                              filename: str = None) -> Dict:
         """Excel 리포트 생성"""
         try:
+            now = datetime.now()
             if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = now.strftime("%Y%m%d_%H%M%S")
                 filename = f"palo_alto_check_report_{timestamp}.xlsx"
             
             filepath = os.path.join(self.reports_dir, filename)
             
-            # 워크북 생성
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Parameter Check Report"
-            
-            # 스타일 정의
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            
-            pass_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            fail_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            error_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-            
-            border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            # 제목 및 요약 정보
-            ws['A1'] = "Palo Alto Parameter Check Report"
-            ws['A1'].font = Font(size=16, bold=True)
-            ws.merge_cells('A1:F1')
-            
-            ws['A3'] = f"생성일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            ws['A4'] = f"총 매개변수: {summary['total']}"
-            ws['A5'] = f"정상: {summary['pass']}"
-            ws['A6'] = f"실패: {summary['fail']}"
-            ws['A7'] = f"오류: {summary['error']}"
-            
-            # 헤더 행
-            headers = ['파라미터', '기대값', '현재값', '상태', '조회 방법', '변경 방법']
-            start_row = 9
-            
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=start_row, column=col)
-                cell.value = header
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.border = border
-                cell.alignment = Alignment(horizontal='center')
-            
-            # 데이터 행
-            for row_idx, result in enumerate(results, start_row + 1):
-                # 데이터 입력
-                ws.cell(row=row_idx, column=1, value=result['parameter'])
-                ws.cell(row=row_idx, column=2, value=result['expected'])
-                ws.cell(row=row_idx, column=3, value=result['current'])
-                ws.cell(row=row_idx, column=4, value=result['status'])
-                ws.cell(row=row_idx, column=5, value=result['query_method'])
-                ws.cell(row=row_idx, column=6, value=result['modify_method'])
-                
-                # 상태에 따른 색상 적용
-                status_fill = None
-                if result['status'] == 'PASS':
-                    status_fill = pass_fill
-                elif result['status'] == 'FAIL':
-                    status_fill = fail_fill
-                elif result['status'] == 'ERROR':
-                    status_fill = error_fill
-                
-                # 행 전체에 스타일 적용
-                for col in range(1, 7):
-                    cell = ws.cell(row=row_idx, column=col)
-                    cell.border = border
-                    if status_fill:
-                        cell.fill = status_fill
-            
-            # 열 너비 자동 조정
-            for col in range(1, 7):
-                column_letter = get_column_letter(col)
-                max_length = 0
-                
-                for row in ws[column_letter]:
-                    try:
-                        if len(str(row.value)) > max_length:
-                            max_length = len(str(row.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)  # 최대 50자로 제한
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # 파일 저장
-            wb.save(filepath)
+            # 요약 정보
+            summary_lines = [
+                f"생성일시: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+                f"총 매개변수: {summary['total']}",
+                f"정상: {summary['pass']}",
+                f"실패: {summary['fail']}",
+                f"오류: {summary['error']}",
+            ]
+            
+            # 열 너비 계산 (두 엔진 모두 행을 쓰기 전에 열 너비를 지정해야 함)
+            col_widths = [len(header) for header in HEADERS]
+            col_widths[0] = max([col_widths[0], len(REPORT_TITLE)] + [len(line) for line in summary_lines])
+            for result in results:
+                for i, field in enumerate(FIELDS):
+                    col_widths[i] = max(col_widths[i], len(str(result[field])))
+            col_widths = [min(width + 2, 50) for width in col_widths]  # 최대 50자로 제한
+            
+            if self._use_xlsxwriter():
+                self._write_excel_xlsxwriter(filepath, results, summary_lines, col_widths)
+            else:
+                self._write_excel_openpyxl(filepath, results, summary_lines, col_widths)
             
             return {
                 'success': True,
@@ -126,7 +82,117 @@ class ReportGenerator:
                 'message': f'Excel 리포트 생성 실패: {str(e)}'
             }
     
-
+    def _use_xlsxwriter(self) -> bool:
+        """Excel 저장 엔진 선택"""
+        if self.excel_engine == "openpyxl":
+            return False
+        if self.excel_engine == "xlsxwriter" and xlsxwriter is None:
+            raise ImportError("xlsxwriter가 설치되어 있지 않습니다")
+        return xlsxwriter is not None
+    
+    def _write_excel_xlsxwriter(self, filepath: str, results: List[Dict],
+                                summary_lines: List[str], col_widths: List[int]):
+        """xlsxwriter constant_memory 모드로 저장 (행을 쓰는 즉시 디스크로 내보냄)"""
+        wb = xlsxwriter.Workbook(filepath, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+            'strings_to_urls': False
+        })
+        try:
+            ws = wb.add_worksheet(SHEET_TITLE)
+            
+            # 서식은 한 번만 생성하여 재사용
+            title_format = wb.add_format({'bold': True, 'font_size': 16})
+            header_format = wb.add_format({
+                'bold': True, 'font_color': '#FFFFFF', 'bg_color': f'#{HEADER_COLOR}',
+                'border': 1, 'align': 'center'
+            })
+            data_format = wb.add_format({'border': 1})
+            status_formats = {
+                status: wb.add_format({'border': 1, 'bg_color': f'#{color}'})
+                for status, color in STATUS_COLORS.items()
+            }
+            
+            for col, width in enumerate(col_widths):
+                ws.set_column(col, col, width)
+            
+            # constant_memory 모드에서는 행 순서대로 기록해야 함
+            ws.merge_range(0, 0, 0, len(HEADERS) - 1, REPORT_TITLE, title_format)
+            for row, line in enumerate(summary_lines, 2):
+                ws.write_string(row, 0, line)
+            
+            ws.write_row(HEADER_ROW - 1, 0, HEADERS, header_format)
+            
+            for row, result in enumerate(results, HEADER_ROW):
+                row_format = status_formats.get(result['status'], data_format)
+                ws.write_row(row, 0, [result[field] for field in FIELDS], row_format)
+        finally:
+            wb.close()
+    
+    def _write_excel_openpyxl(self, filepath: str, results: List[Dict],
+                              summary_lines: List[str], col_widths: List[int]):
+        """openpyxl write-only 모드로 저장"""
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet(SHEET_TITLE)
+        
+        # 스타일 정의 - 워크북에 NamedStyle로 한 번만 등록하고 이름으로 참조
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        
+        wb.add_named_style(NamedStyle(
+            name='header',
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type="solid"),
+            border=border,
+            alignment=Alignment(horizontal='center')
+        ))
+        wb.add_named_style(NamedStyle(name='data_row', border=border))
+        status_styles = {}
+        for status, color in STATUS_COLORS.items():
+            style_name = f'{status.lower()}_row'
+            wb.add_named_style(NamedStyle(
+                name=style_name, border=border,
+                fill=PatternFill(start_color=color, end_color=color, fill_type="solid")
+            ))
+            status_styles[status] = style_name
+        
+        for col, width in enumerate(col_widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        
+        # 제목 및 요약 정보
+        title_cell = WriteOnlyCell(ws, value=REPORT_TITLE)
+        title_cell.font = Font(size=16, bold=True)
+        ws.append([title_cell])
+        ws.merged_cells.add(f'A1:{get_column_letter(len(HEADERS))}1')
+        ws.append([])
+        
+        for line in summary_lines:
+            ws.append([line])
+        ws.append([])
+        
+        # 헤더 행
+        header_row = []
+        for header in HEADERS:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.style = 'header'
+            header_row.append(cell)
+        ws.append(header_row)
+        
+        # 데이터 행 (상태에 따라 행 전체에 색상 적용)
+        for result in results:
+            row_style = status_styles.get(result['status'], 'data_row')
+            row = []
+            for field in FIELDS:
+                cell = WriteOnlyCell(ws, value=result[field])
+                cell.style = row_style
+                row.append(cell)
+            ws.append(row)
+        
+        wb.save(filepath)
     
     def cleanup_old_reports(self, days_old: int = 1):
         """오래된 리포트 파일 정리"""
@@ -136,12 +202,13 @@ class ReportGenerator:
             current_time = time.time()
             cutoff_time = current_time - (days_old * 24 * 60 * 60)
             
-            for filename in os.listdir(self.reports_dir):
-                filepath = os.path.join(self.reports_dir, filename)
-                if os.path.isfile(filepath):
-                    file_time = os.path.getmtime(filepath)
-                    if file_time < cutoff_time:
-                        os.remove(filepath)
+            # is_file()은 디렉토리 읽기 시 얻은 파일 종류(d_type)로 판단하므로 stat 호출 없이
+            # 디렉토리/기타 항목을 거름 (mtime 확인용 stat은 POSIX에서 파일마다 1회 발생)
+            # 심볼릭 링크는 리포트 디렉토리 밖 파일일 수 있으므로 삭제하지 않음
+            with os.scandir(self.reports_dir) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff_time:
+                        os.remove(entry.path)
                         
         except Exception:
             pass  # 정리 실패는 무시
\ No newline at end of file
@@ -4,10 +4,140 @@ SSH 연결 및 명령어 실행 모듈
 """
 
 import paramiko
+import atexit
+import hashlib
+import socket
+import threading
 import time
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional
 
+_RECV_SIZE = 65536  # SSH 채널 패킷 최대 크기에 맞춘 recv 단위
+_WINDOW_SIZE = 2 ** 27  # 대용량 show 출력 시 채널 윈도우 대기 방지
+_KEEPALIVE_INTERVAL = 30  # 초
+_POOL_MAX_IDLE = 120  # 풀에 반납된 연결의 최대 유휴 시간 (초)
+_MAX_EXEC_CHANNELS = 8  # 한 연결에서 동시에 여는 exec 채널 수 (sshd MaxSessions 이하)
+_SHELL_READ_TIMEOUT = 0.5  # shell recv 블로킹 대기 단위 (전체 제한은 command_timeout)
+
+class _SSHPool:
+    """인증된 SSHClient 재사용 풀 - 점검마다 반복되는 TCP/SSH 핸드셰이크 생략"""
+    
+    def __init__(self, max_per_key: int = 4, max_idle: float = _POOL_MAX_IDLE):
+        self.max_per_key = max_per_key
+        self.max_idle = max_idle  # 유휴 연결 최대 보관 시간 (초)
+        self._idle = {}  # key -> deque[(반납 시각, SSHClient)]
+        self.exec_support = {}  # key -> exec 채널 지원 여부 (확인된 장비만, 재연결 시 재확인 생략)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(host: str, username: str, password: str) -> tuple:
+        """풀 키 생성 - 비밀번호가 다르면 기존 연결을 재사용하지 않도록 해시 포함"""
+        return (host, username, hashlib.sha256(password.encode('utf-8')).hexdigest())
+    
+    def _pop_expired(self) -> list:
+        """유휴 시간이 지난 연결을 풀에서 제거해 반환 (잠금 상태에서 호출)"""
+        deadline = time.monotonic() - self.max_idle
+        expired = []
+        for key in list(self._idle):
+            idle = self._idle[key]
+            # 오래된 연결이 왼쪽에 쌓이므로 앞에서부터 제거
+            while idle and idle[0][0] <= deadline:
+                expired.append(idle.popleft()[1])
+            if not idle:
+                del self._idle[key]
+        return expired
+    
+    def acquire(self, key: tuple, password: str, timeout: int) -> paramiko.SSHClient:
+        """유휴 연결 반환, 없으면 새로 연결"""
+        client = None
+        with self._lock:
+            stale = self._pop_expired()
+            idle = self._idle.get(key)
+            while idle:
+                _, candidate = idle.pop()
+                transport = candidate.get_transport()
+                if transport is not None and transport.is_active():
+                    client = candidate
+                    break
+                stale.append(candidate)
+        
+        for old in stale:
+            old.close()
+        if client is not None:
+            # 유휴 중 꺼 둔 keepalive 재개
+            client.get_transport().set_keepalive(_KEEPALIVE_INTERVAL)
+            return client
+        
+        host, username, _ = key
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            client.connect(
+                hostname=host,
+                username=username,
+                password=password,
+                timeout=timeout,
+                allow_agent=False,
+                look_for_keys=False
+            )
+        except Exception:
+            client.close()
+            raise
+        
+        transport = client.get_transport()
+        # 이후 생성되는 모든 채널(exec/shell)에 적용
+        transport.default_window_size = _WINDOW_SIZE
+        # 사용 중인 연결이 NAT/방화벽에서 끊기지 않도록 keepalive 전송 (풀에 반납되면 중지)
+        transport.set_keepalive(_KEEPALIVE_INTERVAL)
+        return client
+    
+    def release(self, key: tuple, client: paramiko.SSHClient):
+        """연결 반납 - 끊긴 연결이거나 풀이 가득 차면 종료"""
+        to_close = []
+        transport = client.get_transport()
+        if transport is not None:
+            # 유휴 연결은 keepalive를 멈춰 장비/NAT의 유휴 타임아웃으로 정리되도록 함
+            transport.set_keepalive(0)
+        with self._lock:
+            to_close.extend(self._pop_expired())
+            if transport is not None and transport.is_active() and self.max_idle > 0:
+                idle = self._idle.setdefault(key, deque())
+                if len(idle) < self.max_per_key:
+                    idle.append((time.monotonic(), client))
+                    client = None
+        
+        if client is not None:
+            to_close.append(client)
+        for old in to_close:
+            old.close()
+    
+    def close_all(self):
+        """풀의 모든 유휴 연결 종료 (프로세스 종료 시 장비에 세션을 남기지 않도록)"""
+        with self._lock:
+            clients = [client for idle in self._idle.values() for _, client in idle]
+            self._idle.clear()
+        
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass  # 종료 시 오류 무시
+
+_pool = _SSHPool()
+atexit.register(_pool.close_all)
+
+# Palo Alto 장비의 일반적인 프롬프트 패턴 (모듈 로드 시 1회 컴파일)
+_PROMPT_RES = [re.compile(p) for p in (
+    r'.*[>#$]\s*$',  # 일반적인 프롬프트 (>, #, $ 로 끝남)
+    r'.*@.*[>#$]\s*$',  # 사용자@호스트 형태
+    r'.+>\s*$',  # > 로 끝나는 프롬프트
+    r'.+#\s*$',  # # 로 끝나는 프롬프트
+)]
+_PROMPT_END_BYTES = b'>#$'  # 프롬프트 마지막 문자 후보
+_ALL_SAME_RE = re.compile(r'all_same\(\d+x\s*(.+)\)')  # 다중 매칭 결과 "ALL_SAME(3x true)" 값 추출
+
 class SSHChecker:
     def __init__(self):
         self.client = None
@@ -15,29 +145,22 @@ class SSHChecker:
         self.is_connected = False
         self.connection_timeout = 30
         self.command_timeout = 10
+        self.exec_supported = True  # exec 채널 미지원 장비는 shell 방식으로 전환
+        self._exec_verified = False  # exec 채널 출력 수신 확인 여부
+        self._pool_key = None
+        self._transport = None
     
     def connect(self, host: str, username: str, password: str) -> Dict:
-        """SSH 연결"""
+        """SSH 연결 (풀에 유휴 연결이 있으면 재사용)"""
         try:
-            self.client = paramiko.SSHClient()
-            self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # SSH 연결
-            self.client.connect(
-                hostname=host,
-                username=username,
-                password=password,
-                timeout=self.connection_timeout,
-                allow_agent=False,
-                look_for_keys=False
-            )
-            
-            # Shell 채널 생성
-            self.shell = self.client.invoke_shell()
-            time.sleep(1)  # 초기 프롬프트 대기
-            
-            # 초기 출력 읽기 (환영 메시지 등)
-            self._read_until_prompt()
+            self._pool_key = _SSHPool.make_key(host, username, password)
+            self.client = _pool.acquire(self._pool_key, password, self.connection_timeout)
+            self._transport = self.client.get_transport()
+            self.shell = None  # shell 채널은 필요할 때 생성
+            # 같은 장비/계정에서 이미 확인한 exec 지원 여부 재사용
+            known = _pool.exec_support.get(self._pool_key)
+            self.exec_supported = known is not False
+            self._exec_verified = known is True
             
             self.is_connected = True
             
@@ -71,6 +194,18 @@ class SSHChecker:
             }
         
         try:
+            # CLI 명령 없이 SSH 프로토콜 수준에서 먼저 확인
+            transport = self._transport
+            if transport is not None and transport.is_active():
+                try:
+                    transport.send_ignore()
+                    return {
+                        'success': True,
+                        'message': 'SSH 연결 정상'
+                    }
+                except Exception:
+                    pass  # 실패 시 실제 명령어로 재확인
+            
             # 간단한 명령어로 연결 테스트
             result = self.execute_command("show system info | head -5")
             if result['success']:
@@ -90,8 +225,105 @@ class SSHChecker:
             }
     
     def execute_command(self, command: str) -> Dict:
-        """명령어 실행"""
-        if not self.is_connected or not self.shell:
+        """명령어 실행 (exec 채널 우선, 미지원 시 shell 방식)"""
+        if self.exec_supported and self.is_connected and self.client:
+            try:
+                result, complete = self._exec(command)
+            except paramiko.SSHException:
+                # exec 채널을 거부하는 장비는 이후 shell 방식만 사용
+                self._set_exec_support(False)
+            except Exception as e:
+                return {
+                    'success': False,
+                    'message': f'명령어 실행 실패: {str(e)}',
+                    'output': ''
+                }
+            else:
+                if complete and not self._exec_verified:
+                    self._set_exec_support(True)
+                if self._exec_verified:
+                    return result
+                # 첫 exec가 출력 없이 종료되거나 EOF 없이 시간 초과 -> exec 미지원으로 간주
+                self._set_exec_support(False)
+        
+        return self.execute_command_shell(command)
+    
+    def _set_exec_support(self, supported: bool):
+        """exec 채널 지원 여부 기록 (풀 키 단위로 저장해 재연결 시 재사용)"""
+        self.exec_supported = supported
+        self._exec_verified = supported
+        if self._pool_key is not None:
+            _pool.exec_support[self._pool_key] = supported
+    
+    def _exec(self, command: str) -> tuple:
+        """exec 채널 실행 후 (결과, 출력 수신 후 정상 종료 여부) 반환"""
+        _, stdout, _ = self.client.exec_command(command, timeout=self.command_timeout)
+        return self._read_exec_channel(stdout.channel)
+    
+    def execute_commands(self, commands: list) -> Dict:
+        """여러 명령어 실행 - exec 채널을 한꺼번에 열어 장비에서 동시에 실행되도록 함
+        
+        반환값: {command: execute_command 결과}
+        """
+        results = {}
+        pending = list(commands)
+        
+        # exec 채널 동작이 확인되지 않았으면 첫 명령어를 단독 실행해 확인 (실패 시 shell 방식 전환)
+        if pending and not self._exec_verified:
+            results[pending[0]] = self.execute_command(pending[0])
+            pending = pending[1:]
+        
+        while pending and self.exec_supported and self.is_connected and self.client:
+            batch = pending[:_MAX_EXEC_CHANNELS]
+            channels = []
+            try:
+                for command in batch:
+                    _, stdout, _ = self.client.exec_command(command, timeout=self.command_timeout)
+                    channels.append((command, stdout.channel))
+            except Exception:
+                pass  # 열지 못한 명령어는 아래에서 개별 실행
+            
+            for command, channel in channels:
+                results[command] = self._read_exec_channel(channel)[0]
+            pending = pending[len(channels):]
+            
+            if len(channels) < len(batch):
+                break
+        
+        # exec 채널을 쓸 수 없는 경우 개별 실행 (shell 방식 전환 포함)
+        for command in pending:
+            results[command] = self.execute_command(command)
+        
+        return results
+    
+    def _read_exec_channel(self, channel) -> tuple:
+        """exec 채널 출력을 EOF까지 읽기 - (결과, 출력 수신 후 정상 종료 여부) 반환"""
+        chunks = []
+        try:
+            while True:
+                chunk = channel.recv(_RECV_SIZE)  # EOF 시 b'' 반환
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except socket.timeout:
+            return {
+                'success': False,
+                'message': f'명령어 실행 시간 초과 ({self.command_timeout}초)',
+                'output': ''
+            }, False
+        finally:
+            channel.close()
+        
+        output = b''.join(chunks).decode('utf-8', errors='ignore').strip()
+        return {
+            'success': True,
+            'message': '명령어 실행 성공',
+            'output': output
+        }, bool(output)
+    
+    def execute_command_shell(self, command: str) -> Dict:
+        """대화형 shell 채널로 명령어 실행"""
+        if not self.is_connected or not self.client:
             return {
                 'success': False,
                 'message': 'SSH 연결이 되어 있지 않음',
@@ -99,23 +331,26 @@ class SSHChecker:
             }
         
         try:
+            if not self.shell:
+                self._open_shell()
+            
             # 명령어 전송
             self.shell.send(command + '\n')
-            time.sleep(1)  # 명령어 실행 대기
             
-            # 출력 읽기
+            # 출력 읽기 (프롬프트가 나올 때까지 대기)
             output = self._read_until_prompt()
             
-            # 명령어 에코 제거
-            lines = output.split('\n')
-            if lines and command.strip() in lines[0]:
-                lines = lines[1:]  # 첫 번째 줄(명령어 에코) 제거
+            # 명령어 에코 제거 (첫 번째 줄만 확인, 전체 라인 분할 없음)
+            first_line, _, rest = output.partition('\n')
+            if command.strip() in first_line:
+                output = rest
             
             # 마지막 프롬프트 라인 제거
-            if lines and self._is_prompt_line(lines[-1]):
-                lines = lines[:-1]
+            head, _, last_line = output.rpartition('\n')
+            if self._is_prompt_line(last_line):
+                output = head
             
-            clean_output = '\n'.join(lines).strip()
+            clean_output = output.strip()
             
             return {
                 'success': True,
@@ -130,38 +365,48 @@ class SSHChecker:
                 'output': ''
             }
     
+    def _open_shell(self):
+        """Shell 채널 생성 (기존 transport 위에 세션만 추가)"""
+        self.shell = self.client.invoke_shell()
+        self.shell.settimeout(_SHELL_READ_TIMEOUT)
+        
+        # 초기 출력 읽기 (환영 메시지 등, 첫 프롬프트가 나오면 바로 반환)
+        self._read_until_prompt()
+    
     def _read_until_prompt(self) -> str:
         """프롬프트가 나올 때까지 출력 읽기"""
-        output = ""
+        buf = bytearray()
         start_time = time.time()
         
         while time.time() - start_time < self.command_timeout:
-            if self.shell.recv_ready():
-                chunk = self.shell.recv(4096).decode('utf-8', errors='ignore')
-                output += chunk
-                
-                # 프롬프트 감지 (마지막 라인이 프롬프트인지 확인)
-                lines = output.split('\n')
-                if lines and self._is_prompt_line(lines[-1]):
-                    break
-            else:
-                time.sleep(0.1)
+            # 데이터가 올 때까지 블로킹 대기 (최대 _SHELL_READ_TIMEOUT초)
+            try:
+                chunk = self.shell.recv(_RECV_SIZE)
+            except socket.timeout:
+                continue
+            if not chunk:
+                break  # 채널 종료
+            buf.extend(chunk)
+            
+            # 프롬프트 감지 (버퍼 끝부분의 마지막 라인만 확인)
+            # memoryview로 끝부분만 한 번 복사 (뷰는 다음 extend 전에 해제)
+            with memoryview(buf) as view:
+                tail = bytes(view[-256:])
+            # 줄바꿈으로 끝나지 않은 마지막 라인만 프롬프트 후보 (완결된 출력 라인은 제외)
+            last_line = tail.rpartition(b'\n')[2]
+            stripped = last_line.rstrip()
+            if not stripped or stripped[-1] not in _PROMPT_END_BYTES:
+                continue  # 프롬프트 종료 문자가 아니면 정규식 검사 생략
+            if self._is_prompt_line(last_line.decode('utf-8', errors='ignore')):
+                break
         
-        return output
+        return buf.decode('utf-8', errors='ignore')
     
     def _is_prompt_line(self, line: str) -> bool:
         """프롬프트 라인인지 확인"""
         line = line.strip()
-        # Palo Alto 장비의 일반적인 프롬프트 패턴
-        prompt_patterns = [
-            r'.*[>#$]\s*$',  # 일반적인 프롬프트 (>, #, $ 로 끝남)
-            r'.*@.*[>#$]\s*$',  # 사용자@호스트 형태
-            r'.+>\s*$',  # > 로 끝나는 프롬프트
-            r'.+#\s*$',  # # 로 끝나는 프롬프트
-        ]
-        
-        for pattern in prompt_patterns:
-            if re.match(pattern, line):
+        for prompt_re in _PROMPT_RES:
+            if prompt_re.match(line):
                 return True
         return False
     
@@ -173,9 +418,11 @@ class SSHChecker:
                 self.shell = None
             
             if self.client:
-                self.client.close()
+                # 풀에 반납 (끊긴 연결은 종료됨)
+                _pool.release(self._pool_key, self.client)
                 self.client = None
             
+            self._transport = None
             self.is_connected = False
             
         except Exception:
@@ -185,24 +432,58 @@ class SSHChecker:
         """객체 소멸자 - 연결 정리"""
         self.disconnect()
 
+# 명령어 결과 캐시 - ParameterChecker 인스턴스/재연결 간 공유
+_CMD_CACHE = {}  # (host, username, command) -> (만료 시각, 결과)
+_CMD_CACHE_LOCK = threading.Lock()
+
+def _prune_cmd_cache(now: float):
+    """만료된 명령어 결과 제거 (잠금 상태에서 호출)"""
+    for key in [key for key, (expires_at, _) in _CMD_CACHE.items() if expires_at <= now]:
+        del _CMD_CACHE[key]
+
 class ParameterChecker:
-    def __init__(self):
+    def __init__(self, cache_ttl: float = 0):
         self.ssh = SSHChecker()
-        self.command_cache = {}  # 명령어 실행 결과 캐시
+        self.host = None
+        self.username = None
+        self.cache_ttl = cache_ttl  # 명령어 결과 캐시 유효 시간 (초), 0이면 캐시 사용 안 함
+        self._pattern_cache = {}  # 파라미터 패턴 -> 컴파일된 정규식
     
     def connect_to_device(self, host: str, username: str, password: str) -> Dict:
-        """장비에 연결"""
-        self.command_cache.clear()  # 새 연결 시 캐시 초기화
+        """장비에 연결 (재연결 시에도 유효 시간 내 캐시는 유지)"""
+        self.host = host
+        self.username = username
         return self.ssh.connect(host, username, password)
     
-    def _execute_command_with_cache(self, command: str) -> Dict:
-        """캐시를 활용한 명령어 실행"""
-        if command in self.command_cache:
-            return self.command_cache[command]
-        
-        result = self.ssh.execute_command(command)
-        self.command_cache[command] = result
-        return result
+    def refresh(self):
+        """현재 장비/계정의 명령어 결과 캐시 삭제"""
+        scope = (self.host, self.username)
+        with _CMD_CACHE_LOCK:
+            for key in [key for key in _CMD_CACHE if key[:2] == scope]:
+                del _CMD_CACHE[key]
+    
+    def _get_cached_result(self, command: str) -> Optional[Dict]:
+        """유효 시간 내 캐시된 명령어 결과 반환 (만료된 항목은 삭제)"""
+        key = (self.host, self.username, command)
+        with _CMD_CACHE_LOCK:
+            hit = _CMD_CACHE.get(key)
+            if hit is None:
+                return None
+            if hit[0] <= time.monotonic():
+                del _CMD_CACHE[key]
+                return None
+        return hit[1]
+    
+    def _store_result(self, command: str, result: Dict):
+        """성공한 결과만 캐시, 실패 시 기존 캐시 무효화"""
+        key = (self.host, self.username, command)
+        now = time.monotonic()
+        with _CMD_CACHE_LOCK:
+            _prune_cmd_cache(now)
+            if result['success'] and self.cache_ttl > 0:
+                _CMD_CACHE[key] = (now + self.cache_ttl, result)
+            else:
+                _CMD_CACHE.pop(key, None)
     
     def check_parameters(self, parameters: list) -> Dict:
         """매개변수들 점검 (명령어 캐싱 적용)"""
@@ -224,10 +505,24 @@ class ParameterChecker:
                 command_groups[command] = []
             command_groups[command].append(param)
         
-        # 2. 각 명령어 그룹 처리
+        # 2. 캐시에 없는 명령어는 한 번에 실행
+        cmd_results = {}
+        uncached = []
+        for command in command_groups:
+            cached = self._get_cached_result(command)
+            if cached is None:
+                uncached.append(command)
+            else:
+                cmd_results[command] = cached
+        
+        if uncached:
+            for command, cmd_result in self.ssh.execute_commands(uncached).items():
+                self._store_result(command, cmd_result)
+                cmd_results[command] = cmd_result
+        
+        # 3. 각 명령어 그룹 처리
         for command, param_group in command_groups.items():
-            # 명령어 한 번만 실행
-            cmd_result = self._execute_command_with_cache(command)
+            cmd_result = cmd_results[command]
             
             if not cmd_result['success']:
                 # 명령어 실행 실패 시 그룹의 모든 파라미터를 에러로 처리
@@ -294,13 +589,65 @@ class ParameterChecker:
             'summary': summary
         }
     
+    def check_many(self, devices: list, parameters: list, max_workers: int = 16) -> list:
+        """여러 장비 동시 점검
+        
+        devices: [{'host': ..., 'username': ..., 'password': ...}, ...]
+        반환값: devices와 같은 순서의 check_parameters 결과 목록 (각 결과에 'host' 포함)
+        """
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError(f'max_workers는 1 이상의 정수여야 합니다: {max_workers!r}')
+        if not devices:
+            return []
+        
+        def check_device(device: Dict) -> Dict:
+            # 장비별 SSH 상태가 섞이지 않도록 작업마다 별도 점검기 사용
+            checker = ParameterChecker(cache_ttl=self.cache_ttl)
+            connection = checker.connect_to_device(device['host'], device['username'], device['password'])
+            if not connection['success']:
+                return {
+                    'success': False,
+                    'message': connection['message'],
+                    'results': []
+                }
+            try:
+                return checker.check_parameters(parameters)
+            finally:
+                checker.disconnect()
+        
+        # 같은 host가 여러 번 있어도 덮어쓰지 않도록 입력 순서(index)로 결과 저장
+        results = [None] * len(devices)
+        # 워커 수가 곧 동시 SSH 접속 수 상한 (sshd MaxStartups 이하로 설정)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(devices))) as executor:
+            futures = {executor.submit(check_device, device): index for index, device in enumerate(devices)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {
+                        'success': False,
+                        'message': f'점검 중 오류: {str(e)}',
+                        'results': []
+                    }
+                result['host'] = devices[index]['host']
+                results[index] = result
+        
+        return results
+    
+    def _compile_pattern(self, pattern: str):
+        """파라미터 패턴 컴파일 (캐시 사용)"""
+        compiled = self._pattern_cache.get(pattern)
+        if compiled is None:
+            compiled = re.compile(pattern, re.MULTILINE | re.IGNORECASE)
+            self._pattern_cache[pattern] = compiled
+        return compiled
+    
     def _parse_output(self, output: str, pattern: str) -> Optional[str]:
         """정규식으로 출력에서 값 추출 (다중 매칭 지원)"""
         try:
-            import re
-            
-            # 모든 매칭 찾기
-            matches = re.findall(pattern, output, re.MULTILINE | re.IGNORECASE)
+            # 모든 매칭 찾기 (컴파일된 패턴 재사용)
+            matches = self._compile_pattern(pattern).findall(output)
             
             if not matches:
                 return None
@@ -334,8 +681,7 @@ class ParameterChecker:
         # 다중 매칭 결과 처리
         if current_clean.startswith('all_same('):
             # "ALL_SAME(3x true)" 형태에서 실제 값 추출
-            import re
-            match = re.search(r'all_same\(\d+x\s*(.+)\)', current_clean)
+            match = _ALL_SAME_RE.search(current_clean)
             if match:
                 actual_value = match.group(1).strip()
                 return expected_clean == actual_value
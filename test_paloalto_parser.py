@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Palo Alto 파라미터 점검기(백업 버전) parser 모듈 테스트 스크립트
+
+prefix 인덱스 파싱과 build_maps 결과가 기존 구현과 같은지 검증합니다.
+"""
+
+import logging
+import os
+import random
+import sys
+
+# 백업 점검기는 파일 단위 import를 사용 (main.py와 동일)
+PARSER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'backup', 'paloalto_parameter_checker_20250730_043420')
+sys.path.insert(0, PARSER_DIR)
+
+import parser as checker_parser
+
+checker_parser.logger.setLevel(logging.ERROR)  # 의도된 파싱 실패 경고는 출력하지 않음
+
+def reference_parse(lines, prefix_map):
+    """기존 구현: 라인마다 모든 prefix를 prefix_map 순서대로 검사"""
+    result = {}
+    for line in lines:
+        line = line.strip().rstrip(',')
+        if not line:
+            continue
+        for prefix, key in prefix_map.items():
+            if line.startswith(prefix):
+                parts = line.split(": ", 1)
+                if len(parts) == 2:
+                    result.setdefault(key, []).append(parts[1].strip())
+    return result
+
+def assert_same_parse(lines, prefix_map):
+    """인덱스 사용 여부와 관계없이 기존 구현과 값/키 순서가 같은지 확인"""
+    expected = reference_parse(lines, prefix_map)
+    for parsed in (checker_parser.parse_command_output(lines, prefix_map),
+                   checker_parser.parse_command_output(lines, prefix_map,
+                                                       checker_parser._build_prefix_index(prefix_map))):
+        assert parsed == expected, (prefix_map, lines, parsed, expected)
+        assert list(parsed) == list(expected), (prefix_map, lines, parsed, expected)
+
+def test_empty_prefix_matches_every_line():
+    """빈 prefix는 첫 글자 버킷과 무관하게 모든 라인과 일치"""
+    result = checker_parser.parse_command_output(["x: 1", "y: 2"], {"": "a", "x": "b"})
+    assert result == {'a': ['1', '2'], 'b': ['1']}, result
+    assert list(result) == ['a', 'b']
+
+    for prefix_map in ({"": "a", "x": "b"}, {"x": "b", "": "a"}, {"x": "b", "": "a", "xy": "c", "y": "d"}):
+        assert_same_parse(["x: 1", "y: 2", "xy: 3", "z: 4", ",", "x: 5,"], prefix_map)
+
+def test_random_prefix_maps():
+    """무작위 prefix/라인 조합에서 기존 선형 탐색과 동일한 결과"""
+    rng = random.Random(0)
+    alphabet = 'abx '
+    for _ in range(300):
+        prefixes = {''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+                    for _ in range(rng.randint(1, 5))}
+        prefix_map = {prefix: f'key{i}' for i, prefix in enumerate(prefixes)}
+        lines = [''.join(rng.choice(alphabet + ':,') for _ in range(rng.randint(0, 6))) + rng.choice(['', ': v'])
+                 for _ in range(rng.randint(1, 8))]
+        assert_same_parse(lines, prefix_map)
+
+def reference_maps(config):
+    """기존 get_prefix_map / get_expected_values / get_command_map / get_command_prefix_map 구현"""
+    prefix_map = {}
+    expected_values = {}
+    command_map = {}
+    command_prefix_map = {}
+    commands_seen = set()
+    for param in config['parameters']:
+        if 'output_prefix' in param:
+            prefix_map[param['output_prefix']] = param['name']
+        expected_values[param['name']] = param['expected_value']
+
+        api_cmd = param['api_command']
+        description = api_cmd.split(' - ', 1)[0].strip() if ' - ' in api_cmd else api_cmd
+        if api_cmd not in commands_seen:
+            if ' - ' in api_cmd:
+                command_map[description] = api_cmd.split(' - ', 1)[1].strip()
+            else:
+                command_map[api_cmd] = api_cmd
+            commands_seen.add(api_cmd)
+
+        prefixes = command_prefix_map.setdefault(description, [])
+        if param['output_prefix'] not in prefixes:
+            prefixes.append(param['output_prefix'])
+    return prefix_map, expected_values, command_map, command_prefix_map
+
+def test_build_maps_matches_getters():
+    """build_maps와 get_* 함수가 기존 getter 구현과 같은 매핑 반환"""
+    for file_name in ('parameters.yaml', 'parameters_with_duplicates_example.yaml'):
+        config = checker_parser.load_expected_config(os.path.join(PARSER_DIR, file_name))
+        expected = reference_maps(config)
+        view = checker_parser.build_maps(config)
+        assert tuple(view[:4]) == expected, file_name
+        assert (checker_parser.get_prefix_map(config),
+                checker_parser.get_expected_values(config),
+                checker_parser.get_command_map(config),
+                checker_parser.get_command_prefix_map(config)) == expected, file_name
+        for built, reference in zip(view[:4], expected):
+            assert list(built) == list(reference), file_name
+
+def test_build_maps_non_string_names():
+    """YAML에서 숫자로 읽힌 name도 기존처럼 그대로 사용"""
+    config = {'parameters': [
+        {'name': 100, 'expected_value': 'yes', 'api_command': 'show a', 'output_prefix': 'a'},
+        {'name': 'timeout', 'expected_value': 30, 'api_command': 'desc - show b', 'output_prefix': 'timeout'},
+    ]}
+    view = checker_parser.build_maps(config)
+    assert tuple(view[:4]) == reference_maps(config)
+    assert view.expected_values == {100: 'yes', 'timeout': 30}
+    assert checker_parser.parse_command_output(['a: yes'], view.prefix_map, view.prefix_index) == {100: ['yes']}
+
+def main():
+    """메인 테스트 함수"""
+    print("🧪 parser 모듈 테스트 시작\n")
+
+    # 정의 순서대로 test_* 함수 실행
+    tests = [value for name, value in list(globals().items()) if name.startswith('test_') and callable(value)]
+
+    success_count = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__doc__}")
+            success_count += 1
+        except Exception as e:
+            print(f"   ❌ {test.__doc__}: {e!r}")
+
+    print("\n" + "="*50)
+    print(f"📊 테스트 결과: {success_count}/{len(tests)} 성공")
+    return 0 if success_count == len(tests) else 1
+
+if __name__ == "__main__":
+    exit(main())
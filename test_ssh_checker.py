@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Palo Alto 파라미터 점검기 SSH 모듈 테스트 스크립트
+
+실제 장비 없이 가짜 paramiko 클라이언트로 SSHChecker / ParameterChecker를 검증합니다.
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+
+# 점검기 모듈은 패키지가 아닌 파일 단위 import를 사용 (app.py와 동일)
+CHECKER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fpat', 'paloalto_parameter_checker')
+sys.path.insert(0, CHECKER_DIR)
+
+import paramiko
+import ssh_checker
+from ssh_checker import ParameterChecker, SSHChecker
+
+PROMPT = b'admin@PA-VM> '
+_ORIGINAL_SSH_CLIENT = paramiko.SSHClient
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+        self.default_window_size = None
+        self.keepalive = None
+
+    def is_active(self):
+        return self.active
+
+    def set_keepalive(self, interval):
+        self.keepalive = interval
+
+    def send_ignore(self):
+        if not self.active:
+            raise EOFError()
+
+class FakeChannel:
+    """recv 호출마다 준비된 조각을 반환 (None은 socket.timeout, 소진 시 EOF)"""
+
+    def __init__(self, chunks=(), on_send=None):
+        self.chunks = list(chunks)
+        self.on_send = on_send
+        self.closed = False
+
+    def recv(self, size):
+        if not self.chunks:
+            return b''
+        chunk = self.chunks.pop(0)
+        if chunk is None:
+            raise socket.timeout()
+        return chunk
+
+    def send(self, data):
+        if self.on_send:
+            self.chunks.extend(self.on_send(data))
+
+    def settimeout(self, timeout):
+        pass
+
+    def close(self):
+        self.closed = True
+
+class FakeStdout:
+    def __init__(self, channel):
+        self.channel = channel
+
+class FakeSSHClient:
+    """장비 동작 모드: exec(정상) / exec_empty(출력 없이 종료) / exec_hang(EOF 없음) / exec_refused(채널 거부)"""
+
+    outputs = {}
+    mode = 'exec'
+    max_channels = None
+    instances = []
+
+    def __init__(self):
+        self.transport = None
+        self.exec_calls = []
+        self.closed = False
+        FakeSSHClient.instances.append(self)
+
+    def set_missing_host_key_policy(self, policy):
+        pass
+
+    def connect(self, hostname, username, password, **kwargs):
+        if password == 'wrong':
+            raise paramiko.AuthenticationException('auth failed')
+        self.transport = FakeTransport()
+
+    def get_transport(self):
+        return self.transport
+
+    def exec_command(self, command, timeout=None):
+        self.exec_calls.append(command)
+        mode = FakeSSHClient.mode
+        if mode == 'exec_refused':
+            raise paramiko.SSHException('exec not supported')
+        if FakeSSHClient.max_channels is not None and len(self.exec_calls) > FakeSSHClient.max_channels:
+            raise paramiko.SSHException('too many channels')
+        if mode == 'exec_empty':
+            chunks = []
+        elif mode == 'exec_hang':
+            chunks = [None]
+        else:
+            chunks = [FakeSSHClient.outputs.get(command, b'')]
+        return None, FakeStdout(FakeChannel(chunks)), None
+
+    def invoke_shell(self):
+        def respond(data):
+            if isinstance(data, str):
+                data = data.encode('utf-8')  # paramiko Channel.send는 str도 허용
+            command = data.decode('utf-8').strip()
+            return [data.replace(b'\n', b'\r\n'), FakeSSHClient.outputs.get(command, b'').replace(b'\n', b'\r\n'), PROMPT]
+        return FakeChannel([b'Welcome\r\n', PROMPT], on_send=respond)
+
+    def close(self):
+        self.closed = True
+        if self.transport:
+            self.transport.active = False
+
+def install_fake_client(mode='exec', outputs=None, max_channels=None):
+    """가짜 클라이언트 설치 및 풀 초기화"""
+    FakeSSHClient.mode = mode
+    FakeSSHClient.outputs = outputs or {}
+    FakeSSHClient.max_channels = max_channels
+    FakeSSHClient.instances = []
+    ssh_checker.paramiko.SSHClient = FakeSSHClient
+    ssh_checker._pool.close_all()
+    ssh_checker._pool.exec_support.clear()
+    ssh_checker._CMD_CACHE.clear()
+
+def teardown_module(module=None):
+    """실제 paramiko.SSHClient 복원 및 풀/캐시 정리"""
+    ssh_checker._pool.close_all()
+    ssh_checker._pool.exec_support.clear()
+    ssh_checker._CMD_CACHE.clear()
+    ssh_checker.paramiko.SSHClient = _ORIGINAL_SSH_CLIENT
+
+def load_default_parameters():
+    """기본 파라미터와 각 명령어의 예상 출력"""
+    with open(os.path.join(CHECKER_DIR, 'data', 'default_params.json'), encoding='utf-8') as f:
+        data = json.load(f)
+    parameters = data if isinstance(data, list) else data.get('parameters', data)
+    outputs = {
+        'show system setting ctd mode': b'CTD mode is: disabled\n',
+        'show system setting session timeout': b'Session timeout: 3600\nUDP timeout: 30\n',
+        'show running security-policy global rematch': b'rematch: yes\n',
+        'show system setting dns-proxy': b'DNS proxy: on\n',
+        'show system setting logging level': b'level: info\nlevel: info\n',
+    }
+    return parameters, outputs
+
+def test_parse_output_default_params():
+    """기본 파라미터 패턴: 단일 값 / ALL_SAME / MIXED 추출"""
+    parameters, outputs = load_default_parameters()
+    checker = ParameterChecker()
+    expected = {
+        'show system setting ctd mode': 'disabled',
+        'show system setting session timeout': 'MIXED(3600,30)',
+        'show running security-policy global rematch': 'yes',
+        'show system setting dns-proxy': 'on',
+        'show system setting logging level': 'ALL_SAME(2x info)',
+    }
+    for param in parameters:
+        output = outputs[param['command']].decode()
+        assert checker._parse_output(output, param['pattern']) == expected[param['command']], param['name']
+
+    # 같은 패턴은 한 번만 컴파일
+    assert len(checker._pattern_cache) == len({param['pattern'] for param in parameters})
+    assert checker._parse_output('anything', '[unclosed') is None
+
+def test_check_parameters_isolates_bad_parameter():
+    """잘못된 파라미터는 해당 행만 ERROR, 같은 명령어의 다른 파라미터는 정상 점검"""
+    parameters, outputs = load_default_parameters()
+    install_fake_client('exec', outputs)
+    command = parameters[0]['command']
+    broken = [
+        dict(parameters[0], name='bad_regex', pattern='[unclosed'),
+        {key: value for key, value in parameters[0].items() if key != 'pattern'},
+    ]
+    broken[1]['name'] = 'missing_pattern'
+
+    checker = ParameterChecker()
+    assert checker.connect_to_device('fw1', 'admin', 'pw')['success']
+    try:
+        result = checker.check_parameters(parameters + broken)
+    finally:
+        checker.disconnect()
+
+    assert result['success']
+    rows = {row['parameter']: row for row in result['results']}
+    assert rows['bad_regex']['current'] == 'PARSE_ERROR'
+    assert rows['missing_pattern']['status'] == 'ERROR' and 'error' in rows['missing_pattern']
+    assert rows[parameters[0]['name']]['query_method'] == command
+    assert rows[parameters[0]['name']]['status'] in ('PASS', 'FAIL')
+    assert result['summary']['total'] == len(parameters) + 2
+    assert result['summary']['error'] == 2
+
+def test_read_until_prompt():
+    """완결된 출력 라인의 >/#/$는 프롬프트로 판단하지 않음"""
+    checker = SSHChecker()
+    checker.shell = FakeChannel([b'show config\r\n', b'deviceconfig { # comment #\r\n',
+                                 b'  more stuff;\r\n', b'admin@fw> ', b'next'])
+    output = checker._read_until_prompt()
+    assert output == 'show config\r\ndeviceconfig { # comment #\r\n  more stuff;\r\nadmin@fw> '
+
+    checker.shell = FakeChannel([b'#####\r\n', b'Welcome\r\n', None, PROMPT])
+    assert checker._read_until_prompt().endswith(PROMPT.decode())
+
+def test_pool_reuse_and_expiry():
+    """풀 재사용, 유휴 중 keepalive 중지, 비밀번호별 분리, 유휴 시간 만료, close_all"""
+    install_fake_client()
+    pool = ssh_checker._pool
+
+    checker = SSHChecker()
+    assert checker.connect('fw1', 'admin', 'pw')['success']
+    first = checker.client
+    assert first.transport.keepalive == ssh_checker._KEEPALIVE_INTERVAL
+    checker.disconnect()
+    assert first.transport.keepalive == 0  # 유휴 중에는 keepalive 중지
+
+    assert checker.connect('fw1', 'admin', 'pw')['success']
+    assert checker.client is first
+    assert first.transport.keepalive == ssh_checker._KEEPALIVE_INTERVAL
+    checker.disconnect()
+
+    assert checker.connect('fw1', 'admin', 'other')['success']
+    assert checker.client is not first
+    checker.disconnect()
+
+    assert not checker.connect('fw1', 'admin', 'wrong')['success']
+
+    # 유휴 시간이 지난 연결은 재사용하지 않고 종료
+    original_idle = pool.max_idle
+    try:
+        pool.max_idle = 0.01
+        time.sleep(0.02)
+        assert checker.connect('fw1', 'admin', 'pw')['success']
+        assert checker.client is not first and first.closed
+        checker.disconnect()
+    finally:
+        pool.max_idle = original_idle
+
+    pool.close_all()
+    assert all(client.closed for client in FakeSSHClient.instances if client.transport is not None)
+    assert not pool._idle
+
+def test_exec_and_shell_fallback():
+    """exec 거부/빈 출력/EOF 없음은 shell 방식으로 전환, 재연결 시 확인 결과 재사용"""
+    outputs = {'show system setting ctd mode': b'CTD mode is: disabled\n'}
+
+    install_fake_client('exec', outputs)
+    checker = SSHChecker()
+    checker.connect('fw1', 'admin', 'pw')
+    result = checker.execute_command('show system setting ctd mode')
+    assert result['success'] and result['output'] == 'CTD mode is: disabled'
+    assert checker.exec_supported and checker.shell is None
+    checker.disconnect()
+
+    checker = SSHChecker()
+    checker.connect('fw1', 'admin', 'pw')
+    assert checker._exec_verified  # 확인된 장비는 첫 명령어 단독 확인 생략
+    checker.disconnect()
+
+    for mode in ('exec_refused', 'exec_empty', 'exec_hang'):
+        install_fake_client(mode, outputs)
+        checker = SSHChecker()
+        checker.connect('fw1', 'admin', 'pw')
+        result = checker.execute_command('show system setting ctd mode')
+        assert result['success'], mode
+        assert result['output'].strip() == 'CTD mode is: disabled', (mode, result)
+        assert not checker.exec_supported, mode
+        checker.disconnect()
+
+        # 재연결 시 확인된 결과를 재사용해 exec를 다시 시도하지 않음
+        exec_calls = sum(len(client.exec_calls) for client in FakeSSHClient.instances)
+        checker = SSHChecker()
+        checker.connect('fw1', 'admin', 'pw')
+        assert not checker.exec_supported, mode
+        assert checker.execute_command('show system setting ctd mode')['success'], mode
+        assert exec_calls == sum(len(client.exec_calls) for client in FakeSSHClient.instances), mode
+        checker.disconnect()
+
+def test_execute_commands_batch():
+    """동시 exec 채널 실행, 채널 제한 시 나머지는 개별 실행"""
+    outputs = {f'show item {i}': f'value: {i}\n'.encode() for i in range(12)}
+    install_fake_client('exec', outputs, max_channels=10)
+    checker = SSHChecker()
+    checker.connect('fw1', 'admin', 'pw')
+
+    results = checker.execute_commands(list(outputs))
+    assert set(results) == set(outputs)
+    for i in range(12):
+        result = results[f'show item {i}']
+        assert result['success'] and result['output'].strip() == f'value: {i}', result
+    checker.disconnect()
+
+def test_check_many():
+    """같은 host가 여러 번 있어도 입력 순서대로 결과 반환"""
+    parameters, outputs = load_default_parameters()
+    install_fake_client('exec', outputs)
+    devices = [
+        {'host': 'fw1', 'username': 'admin', 'password': 'pw'},
+        {'host': 'fw1', 'username': 'admin', 'password': 'wrong'},
+        {'host': 'fw2', 'username': 'admin', 'password': 'pw'},
+    ]
+    results = ParameterChecker().check_many(devices, parameters, max_workers=2)
+    assert [result['host'] for result in results] == ['fw1', 'fw1', 'fw2']
+    assert [result['success'] for result in results] == [True, False, True]
+
+    for max_workers in (0, -1, 1.5):
+        try:
+            ParameterChecker().check_many(devices, parameters, max_workers=max_workers)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'max_workers={max_workers} 허용됨')
+    assert ParameterChecker().check_many([], parameters) == []
+
+def test_command_cache_ttl():
+    """캐시는 기본 비활성, 계정별 분리, 만료 및 refresh"""
+    parameters, outputs = load_default_parameters()
+    install_fake_client('exec', outputs)
+
+    def run(username, ttl):
+        checker = ParameterChecker(cache_ttl=ttl)
+        checker.connect_to_device('fw1', username, 'pw')
+        try:
+            return checker, checker.check_parameters(parameters)
+        finally:
+            checker.disconnect()
+
+    def exec_count():
+        return sum(len(client.exec_calls) for client in FakeSSHClient.instances)
+
+    checker, result = run('admin', 0)
+    assert result['success'] and result['summary']['total'] == len(parameters)
+    commands = len({param['command'] for param in parameters})
+    assert exec_count() == commands and not ssh_checker._CMD_CACHE
+
+    run('admin', 30)
+    run('admin', 30)
+    assert exec_count() == commands * 2
+
+    run('auditor', 30)  # 다른 계정은 캐시를 공유하지 않음
+    assert exec_count() == commands * 3
+
+    checker, _ = run('admin', 30)
+    checker.refresh()
+    run('admin', 30)
+    assert exec_count() == commands * 4
+
+    run('short', 0.01)
+    time.sleep(0.02)
+    run('other', 0)  # 저장 시 만료 항목 정리
+    assert all(key[1] != 'short' for key in ssh_checker._CMD_CACHE)
+
+def main():
+    """메인 테스트 함수"""
+    print("🧪 SSH 점검 모듈 테스트 시작\n")
+
+    # 정의 순서대로 test_* 함수 실행
+    tests = [value for name, value in list(globals().items()) if name.startswith('test_') and callable(value)]
+
+    success_count = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__doc__}")
+            success_count += 1
+        except Exception as e:
+            print(f"   ❌ {test.__doc__}: {e!r}")
+
+    teardown_module()
+    
+    print("\n" + "="*50)
+    print(f"📊 테스트 결과: {success_count}/{len(tests)} 성공")
+    return 0 if success_count == len(tests) else 1
+
+if __name__ == "__main__":
+    exit(main())